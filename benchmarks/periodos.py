@@ -0,0 +1,122 @@
+"""Mede as consultas por período de pessoa_tipo em uma base com N intervalos.
+
+Popula um banco vazio (DATABASE_URL, padrão SQLite em /tmp) e cronometra as
+rotas de vigência, sobreposição e histórico, além da checagem de conflito
+feita em cada criação/atualização:
+
+    python benchmarks/periodos.py --intervalos 5000000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('DATABASE_URL', 'sqlite:////tmp/periodos.db')
+
+from app import Pessoa, PessoaTipo, TipoPessoa, app, buscar_conflito, db  # noqa: E402
+
+INICIO = date(2000, 1, 1)
+DIAS = 25 * 365
+
+
+def popular(intervalos, tipos, por_pessoa, lote=50000):
+    pessoas = intervalos // por_pessoa
+    db.session.execute(db.insert(TipoPessoa), [{'id': t, 'tipo': 'Tipo {}'.format(t)} for t in range(1, tipos + 1)])
+    for primeiro in range(1, pessoas + 1, lote):
+        db.session.execute(db.insert(Pessoa), [
+            {'id': p, 'nome': 'Pessoa {}'.format(p)} for p in range(primeiro, min(pessoas + 1, primeiro + lote))
+        ])
+    aleatorio = random.Random(42)
+    linhas = []
+    for pessoa_id in range(1, pessoas + 1):
+        # Períodos consecutivos e sem sobreposição; o último fica em aberto em 30% dos casos
+        dia = aleatorio.randrange(DIAS // 2)
+        for n in range(por_pessoa):
+            inicio = INICIO + timedelta(days=dia)
+            duracao = aleatorio.randrange(30, DIAS // por_pessoa)
+            aberto = n == por_pessoa - 1 and aleatorio.random() < 0.3
+            linhas.append({
+                'pessoa_id': pessoa_id,
+                'tipo_id': aleatorio.randrange(1, tipos + 1),
+                'data_inicio': inicio,
+                'data_fim': None if aberto else inicio + timedelta(days=duracao)
+            })
+            dia += duracao + 1
+        if len(linhas) >= lote:
+            db.session.execute(db.insert(PessoaTipo), linhas)
+            linhas = []
+    if linhas:
+        db.session.execute(db.insert(PessoaTipo), linhas)
+    db.session.commit()
+    return pessoas
+
+
+def cronometrar(nome, funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    tempos.sort()
+    print('{:<34} mediana {:8.2f} ms   p95 {:8.2f} ms'.format(
+        nome, statistics.median(tempos), tempos[int(len(tempos) * 0.95) - 1]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--intervalos', type=int, default=5000000)
+    parser.add_argument('--tipos', type=int, default=20)
+    parser.add_argument('--por-pessoa', type=int, default=5)
+    parser.add_argument('--repeticoes', type=int, default=200)
+    args = parser.parse_args()
+
+    app.config['LIMITES_ATIVOS'] = False
+    cliente = app.test_client()
+    aleatorio = random.Random(7)
+
+    with app.app_context():
+        db.create_all()
+        if PessoaTipo.query.first() is None:
+            inicio = time.perf_counter()
+            pessoas = popular(args.intervalos, args.tipos, args.por_pessoa)
+            print('populado: {} intervalos em {:.0f} s'.format(args.intervalos, time.perf_counter() - inicio))
+        else:
+            pessoas = db.session.query(db.func.max(Pessoa.id)).scalar()
+        print('intervalos: {}  pessoas: {}  tipos: {}'.format(PessoaTipo.query.count(), pessoas, args.tipos))
+
+        def data():
+            return (INICIO + timedelta(days=aleatorio.randrange(DIAS))).isoformat()
+
+        def get(url):
+            resposta = cliente.get(url)
+            assert resposta.status_code == 200, resposta.status_code
+
+        cronometrar('vigentes (tipo, data, 100)', lambda: get(
+            '/pessoa_tipo/vigentes?tipo_id={}&data={}&limite=100'.format(aleatorio.randrange(1, args.tipos + 1), data())
+        ), args.repeticoes)
+        cronometrar('vigentes (pessoa, data)', lambda: get(
+            '/pessoa_tipo/vigentes?pessoa_id={}&data={}'.format(aleatorio.randrange(1, pessoas + 1), data())
+        ), args.repeticoes)
+        def sobrepostos():
+            dia = INICIO + timedelta(days=aleatorio.randrange(DIAS))
+            get('/pessoa_tipo/sobrepostos?tipo_id={}&inicio={}&fim={}&limite=100'.format(
+                aleatorio.randrange(1, args.tipos + 1), dia.isoformat(), (dia + timedelta(days=30)).isoformat()))
+        cronometrar('sobrepostos (tipo, 30 dias, 100)', sobrepostos, args.repeticoes)
+        cronometrar('historico da pessoa', lambda: get(
+            '/pessoas/{}/historico'.format(aleatorio.randrange(1, pessoas + 1))
+        ), args.repeticoes)
+
+        def conflito():
+            dia = INICIO + timedelta(days=aleatorio.randrange(DIAS))
+            buscar_conflito(aleatorio.randrange(1, pessoas + 1), aleatorio.randrange(1, args.tipos + 1),
+                            dia, dia + timedelta(days=365))
+            db.session.rollback()
+        cronometrar('checagem de conflito', conflito, args.repeticoes)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Mede a vazão (requisições/s) e a latência de uma rota da API.
+
+    python benchmarks/vazao.py http://127.0.0.1:8000/servidores --conexoes 16 --duracao 20 --cpus 3
+
+Use --cpus para fixar o gerador de carga em núcleos que o servidor não usa
+(por exemplo, servidor com `taskset -c 0-2` e gerador com --cpus 3).
+"""
+import argparse
+import http.client
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+def _cliente(url, fim, latencias, erros):
+    partes = urlsplit(url)
+    caminho = partes.path + ('?' + partes.query if partes.query else '')
+    conexao = http.client.HTTPConnection(partes.hostname, partes.port or 80, timeout=30)
+    while time.perf_counter() < fim:
+        inicio = time.perf_counter()
+        try:
+            conexao.request('GET', caminho)
+            resposta = conexao.getresponse()
+            resposta.read()
+            if resposta.status != 200:
+                erros.append(resposta.status)
+                continue
+        except (OSError, http.client.HTTPException):
+            erros.append(None)
+            conexao.close()
+            conexao = http.client.HTTPConnection(partes.hostname, partes.port or 80, timeout=30)
+            continue
+        latencias.append(time.perf_counter() - inicio)
+    conexao.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('url')
+    parser.add_argument('--conexoes', type=int, default=16)
+    parser.add_argument('--duracao', type=float, default=20)
+    parser.add_argument('--cpus', help='Núcleos do gerador de carga, ex.: 3 ou 2,3')
+    args = parser.parse_args()
+    if args.cpus:
+        os.sched_setaffinity(0, {int(cpu) for cpu in args.cpus.split(',')})
+
+    latencias, erros = [], []
+    fim = time.perf_counter() + args.duracao
+    threads = [threading.Thread(target=_cliente, args=(args.url, fim, latencias, erros))
+               for _ in range(args.conexoes)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    latencias.sort()
+    total = len(latencias)
+    if not total:
+        raise SystemExit('Nenhuma requisição concluída ({} erros)'.format(len(erros)))
+    print('requisicoes: {}  erros: {}'.format(total, len(erros)))
+    print('vazao: {:.0f} req/s'.format(total / args.duracao))
+    print('latencia p50: {:.1f} ms  p99: {:.1f} ms'.format(
+        latencias[total // 2] * 1000, latencias[min(total - 1, int(total * 0.99))] * 1000))
+
+
+if __name__ == '__main__':
+    main()
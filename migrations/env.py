@@ -0,0 +1,174 @@
+import logging
+from logging.config import fileConfig
+
+from flask import current_app
+
+from alembic import context
+from alembic.operations import MigrateOperation, Operations
+
+# this is the Alembic Config object, which provides
+# access to the values within the .ini file in use.
+config = context.config
+
+# Interpret the config file for Python logging.
+# This line sets up loggers basically.
+fileConfig(config.config_file_name)
+logger = logging.getLogger('alembic.env')
+
+
+def get_engine():
+    try:
+        # this works with Flask-SQLAlchemy<3 and Alchemical
+        return current_app.extensions['migrate'].db.get_engine()
+    except (TypeError, AttributeError):
+        # this works with Flask-SQLAlchemy>=3
+        return current_app.extensions['migrate'].db.engine
+
+
+def get_engine_url():
+    try:
+        return get_engine().url.render_as_string(hide_password=False).replace(
+            '%', '%%')
+    except AttributeError:
+        return str(get_engine().url).replace('%', '%%')
+
+
+# Operações de índice sem bloqueio de escrita. No MySQL usam
+# ALGORITHM=INPLACE, LOCK=NONE (a migração falha em vez de copiar a tabela
+# caso o servidor não consiga criar o índice online); nos demais bancos,
+# inclusive no SQLite usado nos testes, equivalem a create_index/drop_index.
+@Operations.register_operation('criar_indice_online')
+class CriarIndiceOnline(MigrateOperation):
+    def __init__(self, nome, tabela, colunas, unique=False):
+        self.nome = nome
+        self.tabela = tabela
+        self.colunas = colunas
+        self.unique = unique
+
+    @classmethod
+    def criar_indice_online(cls, operations, nome, tabela, colunas, unique=False):
+        return operations.invoke(cls(nome, tabela, colunas, unique))
+
+    def reverse(self):
+        return RemoverIndiceOnline(self.nome, self.tabela)
+
+
+@Operations.register_operation('remover_indice_online')
+class RemoverIndiceOnline(MigrateOperation):
+    def __init__(self, nome, tabela):
+        self.nome = nome
+        self.tabela = tabela
+
+    @classmethod
+    def remover_indice_online(cls, operations, nome, tabela):
+        return operations.invoke(cls(nome, tabela))
+
+
+def _mysql(operations):
+    return operations.migration_context.dialect.name == 'mysql'
+
+
+@Operations.implementation_for(CriarIndiceOnline)
+def criar_indice_online(operations, operacao):
+    if not _mysql(operations):
+        operations.create_index(operacao.nome, operacao.tabela, operacao.colunas, unique=operacao.unique)
+        return
+    operations.execute('ALTER TABLE `{}` ADD {}INDEX `{}` ({}), ALGORITHM=INPLACE, LOCK=NONE'.format(
+        operacao.tabela,
+        'UNIQUE ' if operacao.unique else '',
+        operacao.nome,
+        ', '.join('`{}`'.format(coluna) for coluna in operacao.colunas)
+    ))
+
+
+@Operations.implementation_for(RemoverIndiceOnline)
+def remover_indice_online(operations, operacao):
+    if not _mysql(operations):
+        operations.drop_index(operacao.nome, table_name=operacao.tabela)
+        return
+    operations.execute('ALTER TABLE `{}` DROP INDEX `{}`, ALGORITHM=INPLACE, LOCK=NONE'.format(
+        operacao.tabela, operacao.nome
+    ))
+
+
+# add your model's MetaData object here
+# for 'autogenerate' support
+# from myapp import mymodel
+# target_metadata = mymodel.Base.metadata
+config.set_main_option('sqlalchemy.url', get_engine_url())
+target_db = current_app.extensions['migrate'].db
+
+# other values from the config, defined by the needs of env.py,
+# can be acquired:
+# my_important_option = config.get_main_option("my_important_option")
+# ... etc.
+
+
+def get_metadata():
+    if hasattr(target_db, 'metadatas'):
+        return target_db.metadatas[None]
+    return target_db.metadata
+
+
+def run_migrations_offline():
+    """Run migrations in 'offline' mode.
+
+    This configures the context with just a URL
+    and not an Engine, though an Engine is acceptable
+    here as well.  By skipping the Engine creation
+    we don't even need a DBAPI to be available.
+
+    Calls to context.execute() here emit the given string to the
+    script output.
+
+    """
+    url = config.get_main_option("sqlalchemy.url")
+    context.configure(
+        url=url, target_metadata=get_metadata(), literal_binds=True
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    """Run migrations in 'online' mode.
+
+    In this scenario we need to create an Engine
+    and associate a connection with the context.
+
+    """
+
+    # this callback is used to prevent an auto-migration from being generated
+    # when there are no changes to the schema
+    # reference: http://alembic.zzzcomputing.com/en/latest/cookbook.html
+    def process_revision_directives(context, revision, directives):
+        if getattr(config.cmd_opts, 'autogenerate', False):
+            script = directives[0]
+            if script.upgrade_ops.is_empty():
+                directives[:] = []
+                logger.info('No changes in schema detected.')
+
+    conf_args = current_app.extensions['migrate'].configure_args
+    if conf_args.get("process_revision_directives") is None:
+        conf_args["process_revision_directives"] = process_revision_directives
+
+    connectable = get_engine()
+
+    with connectable.connect() as connection:
+        # O SQLite não altera colunas com ALTER TABLE: usa o modo batch
+        conf_args.setdefault('render_as_batch', connection.dialect.name == 'sqlite')
+        context.configure(
+            connection=connection,
+            target_metadata=get_metadata(),
+            **conf_args
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
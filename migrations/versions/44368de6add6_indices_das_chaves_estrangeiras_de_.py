@@ -0,0 +1,55 @@
+"""indices das chaves estrangeiras de pessoa_tipo
+
+Revision ID: 44368de6add6
+Revises: 56818f2c92e9
+Create Date: 2026-10-19 18:30:20.343520
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '44368de6add6'
+down_revision = '56818f2c92e9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # No MySQL, o índice implícito criado para cada chave estrangeira é
+    # descartado automaticamente quando estes índices passam a atendê-la
+    op.criar_indice_online('ix_pessoa_tipo_pessoa_id', 'pessoa_tipo', ['pessoa_id'])
+    op.criar_indice_online('ix_pessoa_tipo_tipo_id', 'pessoa_tipo', ['tipo_id'])
+
+
+def downgrade():
+    # No MySQL a chave estrangeira precisa de um índice e, sem outro que a
+    # atenda, remover estes falha com o erro 1553. As chaves são removidas e
+    # recriadas em volta, e o MySQL volta a criar o índice implícito de cada uma
+    # (recriar a chave copia a tabela, ao contrário da remoção do índice).
+    contexto = op.get_context()
+    chaves = []
+    if contexto.dialect.name == 'mysql' and contexto.as_sql:
+        # Sem conexão (flask db downgrade --sql): nomes que o InnoDB dá às
+        # chaves sem nome criadas pela migração inicial
+        chaves = [
+            {'name': 'pessoa_tipo_ibfk_1', 'constrained_columns': ['pessoa_id'],
+             'referred_table': 'pessoas', 'referred_columns': ['id']},
+            {'name': 'pessoa_tipo_ibfk_2', 'constrained_columns': ['tipo_id'],
+             'referred_table': 'tipos_de_pessoas', 'referred_columns': ['id']},
+        ]
+    elif contexto.dialect.name == 'mysql':
+        chaves = [
+            chave for chave in sa.inspect(op.get_bind()).get_foreign_keys('pessoa_tipo')
+            if chave['constrained_columns'] in (['pessoa_id'], ['tipo_id'])
+        ]
+    for chave in chaves:
+        op.drop_constraint(chave['name'], 'pessoa_tipo', type_='foreignkey')
+
+    op.remover_indice_online('ix_pessoa_tipo_tipo_id', 'pessoa_tipo')
+    op.remover_indice_online('ix_pessoa_tipo_pessoa_id', 'pessoa_tipo')
+
+    for chave in chaves:
+        op.create_foreign_key(chave['name'], 'pessoa_tipo', chave['referred_table'],
+                              chave['constrained_columns'], chave['referred_columns'])
@@ -0,0 +1,126 @@
+"""rastreamento de alteracoes
+
+Revision ID: 56818f2c92e9
+Revises: ad4a4d2d4a03
+Create Date: 2026-10-19 18:30:19.711050
+
+"""
+from datetime import datetime, timezone
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '56818f2c92e9'
+down_revision = 'ad4a4d2d4a03'
+branch_labels = None
+depends_on = None
+
+TABELAS = ('servidores', 'aposentados', 'beneficiarios', 'pessoas', 'tipos_de_pessoas', 'pessoa_tipo')
+
+# Linhas por lote no preenchimento; ajustável com: flask db upgrade -x lote=N
+LOTE = 10000
+
+
+def _tabela(nome):
+    return sa.table(nome, sa.column('id'), sa.column('criado_em'), sa.column('atualizado_em'))
+
+
+ALTERACOES = sa.table('alteracoes', sa.column('id'), sa.column('recurso'), sa.column('registro_id'),
+                      sa.column('operacao'), sa.column('ocorrido_em'))
+
+
+def _registrar(registros, deslocamento, *condicoes):
+    # Registros existentes entram no feed como 'criado', com o número do id
+    # somado ao maior id das tabelas anteriores
+    return ALTERACOES.insert().from_select(
+        ['id', 'recurso', 'registro_id', 'operacao', 'ocorrido_em'],
+        sa.select(registros.c.id + deslocamento, sa.literal(registros.name), registros.c.id,
+                  sa.literal('criado'), registros.c.criado_em).where(*condicoes)
+    )
+
+
+def _preencher_em_lotes(instante, sequencia):
+    # Cada lote é confirmado sozinho: no MySQL, um UPDATE ou INSERT ... SELECT
+    # sobre a tabela inteira bloquearia as escritas nela até terminar
+    lote = int(context.get_x_argument(as_dictionary=True).get('lote', LOTE))
+    conexao = op.get_bind()
+    deslocamento = 0
+    with op.get_context().autocommit_block():
+        for tabela in TABELAS:
+            registros = _tabela(tabela)
+            inicio = 0
+            while True:
+                # Relido a cada lote, pois a aplicação continua gravando. Ao sair,
+                # nenhum id acima de "maior" foi preenchido: a próxima tabela começa nele
+                maior = conexao.execute(sa.select(sa.func.max(registros.c.id))).scalar() or 0
+                if inicio >= maior:
+                    break
+                faixa = (registros.c.id > inicio, registros.c.id <= inicio + lote)
+                conexao.execute(registros.update().where(*faixa).values(criado_em=instante, atualizado_em=instante))
+                conexao.execute(_registrar(registros, deslocamento, *faixa))
+                inicio += lote
+            deslocamento += maior
+        # A numeração continua depois da última alteração preenchida
+        conexao.execute(sequencia.insert().values(id=1, valor=deslocamento))
+
+
+def _preencher_de_uma_vez(instante, sequencia):
+    # `flask db upgrade --sql` não consulta o banco: gera um comando por
+    # tabela, que bloqueia as escritas nela e exige uma janela de manutenção
+    deslocamento = sa.literal(0)
+    for tabela in TABELAS:
+        registros = _tabela(tabela)
+        op.execute(registros.update().values(criado_em=instante, atualizado_em=instante))
+        op.execute(_registrar(registros, deslocamento))
+        maior = sa.select(sa.func.coalesce(sa.func.max(registros.c.id), 0)).scalar_subquery()
+        deslocamento = deslocamento + maior
+    op.execute(sequencia.insert().from_select(['id', 'valor'], sa.select(sa.literal(1), deslocamento)))
+
+
+def upgrade():
+    # Colunas anuláveis sem valor padrão: o MySQL 8 as adiciona sem copiar a tabela
+    for tabela in TABELAS:
+        op.add_column(tabela, sa.Column('criado_em', sa.DateTime(), nullable=True))
+        op.add_column(tabela, sa.Column('atualizado_em', sa.DateTime(), nullable=True))
+
+    op.create_table('alteracoes',
+        sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), autoincrement=False, nullable=False),
+        sa.Column('recurso', sa.String(length=50), nullable=False),
+        sa.Column('registro_id', sa.Integer(), nullable=False),
+        sa.Column('operacao', sa.String(length=10), nullable=False),
+        sa.Column('ocorrido_em', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_alteracoes_recurso_id', 'alteracoes', ['recurso', 'id'])
+
+    sequencia = op.create_table('sequencia_alteracoes',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('valor', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    # Registros anteriores ao rastreamento recebem o instante da migração e
+    # entram no feed, para que um cliente que sincroniza do zero (since=0) os receba
+    instante = sa.literal(datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0), sa.DateTime())
+    if context.is_offline_mode():
+        _preencher_de_uma_vez(instante, sequencia)
+    else:
+        _preencher_em_lotes(instante, sequencia)
+
+    # Os índices vêm depois do preenchimento para não serem atualizados linha a linha
+    for tabela in TABELAS:
+        op.criar_indice_online('ix_{}_atualizado_em'.format(tabela), tabela, ['atualizado_em'])
+
+
+def downgrade():
+    op.drop_table('sequencia_alteracoes')
+    op.drop_index('ix_alteracoes_recurso_id', table_name='alteracoes')
+    op.drop_table('alteracoes')
+
+    for tabela in TABELAS:
+        op.remover_indice_online('ix_{}_atualizado_em'.format(tabela), tabela)
+        with op.batch_alter_table(tabela) as batch_op:
+            batch_op.drop_column('atualizado_em')
+            batch_op.drop_column('criado_em')
@@ -0,0 +1,31 @@
+"""indices de periodo de pessoa_tipo
+
+Revision ID: 628c5bb7d477
+Revises: 44368de6add6
+Create Date: 2026-10-19 18:32:10.165032
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '628c5bb7d477'
+down_revision = '44368de6add6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.criar_indice_online('ix_pessoa_tipo_tipo_periodo', 'pessoa_tipo', ['tipo_id', 'data_inicio', 'data_fim'])
+    op.criar_indice_online('ix_pessoa_tipo_pessoa_periodo', 'pessoa_tipo', ['pessoa_id', 'tipo_id', 'data_inicio'])
+    # Os índices de uma coluna passam a ser prefixos dos compostos
+    op.remover_indice_online('ix_pessoa_tipo_tipo_id', 'pessoa_tipo')
+    op.remover_indice_online('ix_pessoa_tipo_pessoa_id', 'pessoa_tipo')
+
+
+def downgrade():
+    op.criar_indice_online('ix_pessoa_tipo_pessoa_id', 'pessoa_tipo', ['pessoa_id'])
+    op.criar_indice_online('ix_pessoa_tipo_tipo_id', 'pessoa_tipo', ['tipo_id'])
+    op.remover_indice_online('ix_pessoa_tipo_pessoa_periodo', 'pessoa_tipo')
+    op.remover_indice_online('ix_pessoa_tipo_tipo_periodo', 'pessoa_tipo')
@@ -0,0 +1,82 @@
+"""inicial
+
+Revision ID: ad4a4d2d4a03
+Revises:
+Create Date: 2026-10-19 18:30:19.083139
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ad4a4d2d4a03'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Tabelas como eram criadas antes do versionamento. Bancos já existentes
+    # devem apenas ser marcados com: flask db stamp ad4a4d2d4a03
+    op.create_table('servidores',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('nome', sa.String(length=100), nullable=False),
+        sa.Column('cargo', sa.String(length=50), nullable=True),
+        sa.Column('data_admissao', sa.Date(), nullable=True),
+        sa.Column('email', sa.String(length=100), nullable=True),
+        sa.Column('telefone', sa.String(length=20), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('aposentados',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('nome', sa.String(length=100), nullable=False),
+        sa.Column('cargo', sa.String(length=50), nullable=True),
+        sa.Column('data_aposentadoria', sa.Date(), nullable=True),
+        sa.Column('email', sa.String(length=100), nullable=True),
+        sa.Column('telefone', sa.String(length=20), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('beneficiarios',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('nome', sa.String(length=100), nullable=False),
+        sa.Column('cpf', sa.String(length=11), nullable=True),
+        sa.Column('data_nascimento', sa.Date(), nullable=True),
+        sa.Column('email', sa.String(length=100), nullable=True),
+        sa.Column('telefone', sa.String(length=20), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('pessoas',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('nome', sa.String(length=100), nullable=False),
+        sa.Column('cpf', sa.String(length=11), nullable=True),
+        sa.Column('data_nascimento', sa.Date(), nullable=True),
+        sa.Column('email', sa.String(length=100), nullable=True),
+        sa.Column('telefone', sa.String(length=20), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('cpf')
+    )
+    op.create_table('tipos_de_pessoas',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tipo', sa.String(length=50), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('pessoa_tipo',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('pessoa_id', sa.Integer(), nullable=True),
+        sa.Column('tipo_id', sa.Integer(), nullable=True),
+        sa.Column('data_inicio', sa.Date(), nullable=True),
+        sa.Column('data_fim', sa.Date(), nullable=True),
+        sa.ForeignKeyConstraint(['pessoa_id'], ['pessoas.id']),
+        sa.ForeignKeyConstraint(['tipo_id'], ['tipos_de_pessoas.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('pessoa_tipo')
+    op.drop_table('tipos_de_pessoas')
+    op.drop_table('pessoas')
+    op.drop_table('beneficiarios')
+    op.drop_table('aposentados')
+    op.drop_table('servidores')
@@ -0,0 +1,106 @@
+"""Servidor de produção da API.
+
+Executa o app sob o gunicorn (servidor WSGI com processos pré-criados):
+
+    python -m servidor --workers 4 --threads 8
+
+Recarga sem derrubar conexões: `kill -HUP $(cat servidor.pid)`. O mestre sobe
+workers novos e os antigos terminam as requisições em andamento antes de sair.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m servidor', description=__doc__.splitlines()[0])
+    parser.add_argument('--bind', default=os.environ.get('BIND', '0.0.0.0:8000'),
+                        help='Endereço de escuta (padrão: %(default)s)')
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('WORKERS', multiprocessing.cpu_count() * 2 + 1)),
+                        help='Processos worker (padrão: 2 x CPUs + 1 = %(default)s)')
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('THREADS', 4)),
+                        help='Threads por worker no modo gthread (padrão: %(default)s)')
+    parser.add_argument('--worker-class', default=os.environ.get('WORKER_CLASS', 'gthread'),
+                        help="Tipo de worker: 'gthread' ou 'gevent' para muitas conexões SSE (padrão: %(default)s)")
+    parser.add_argument('--worker-connections', type=int, default=1000,
+                        help='Conexões simultâneas por worker gevent (padrão: %(default)s)')
+    parser.add_argument('--max-requests', type=int, default=int(os.environ.get('MAX_REQUESTS', 0)),
+                        help='Recicla o worker após N requisições para liberar memória; conexões keep-alive '
+                             'abertas nele são fechadas. 0 desativa (padrão: %(default)s)')
+    parser.add_argument('--max-requests-jitter', type=int, default=100,
+                        help='Variação aleatória do limite acima, evita reinícios simultâneos (padrão: %(default)s)')
+    parser.add_argument('--timeout', type=int, default=30,
+                        help='Segundos sem resposta até o worker ser reiniciado (padrão: %(default)s)')
+    parser.add_argument('--graceful-timeout', type=int, default=30,
+                        help='Segundos para concluir requisições em andamento na recarga (padrão: %(default)s)')
+    parser.add_argument('--preload', action='store_true',
+                        help='Carrega o app no mestre antes do fork (inicia mais rápido, mas HUP não recarrega o código)')
+    parser.add_argument('--pid', default='servidor.pid',
+                        help='Arquivo com o PID do mestre, usado para enviar HUP (padrão: %(default)s)')
+    return parser.parse_args(argv)
+
+
+def post_fork(server, worker):
+    # Só com --preload o app já foi importado no mestre. Sem ele, importar aqui
+    # anteciparia o import para antes do monkey patching dos workers gevent.
+    if 'app' not in sys.modules:
+        return
+    # Conexões e threads herdadas do mestre não podem ser compartilhadas:
+    # cada worker abre as suas depois do fork
+    from app import app, db
+    with app.app_context():
+        db.engine.dispose(close=False)
+    app.extensions.pop('barramento', None)
+
+
+def _configurar_workers(app, workers):
+    # Com o barramento 'local', um worker não vê as alterações feitas pelos
+    # outros: o cache de itens e os assinantes de /eventos ficariam defasados
+    if workers > 1 and app.config['EVENTOS_BROKER'] != 'banco':
+        app.config['EVENTOS_BROKER'] = 'banco'
+
+
+def main(argv=None):
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        raise SystemExit('O servidor de produção requer o gunicorn: pip install gunicorn')
+
+    args = _parse_args(argv)
+    if args.worker_class == 'gthread':
+        print('Aviso: no modo gthread cada conexão aberta em /eventos ocupa uma thread; '
+              'com --threads {} e {} workers, {} painéis lotam o servidor. '
+              'Para SSE use --worker-class gevent.'.format(args.threads, args.workers, args.threads * args.workers),
+              file=sys.stderr)
+
+    class Servidor(BaseApplication):
+        def load_config(self):
+            opcoes = {
+                'bind': args.bind,
+                'workers': args.workers,
+                'threads': args.threads,
+                'worker_class': args.worker_class,
+                'worker_connections': args.worker_connections,
+                'max_requests': args.max_requests,
+                'max_requests_jitter': args.max_requests_jitter,
+                'timeout': args.timeout,
+                'graceful_timeout': args.graceful_timeout,
+                'preload_app': args.preload,
+                'pidfile': args.pid,
+                'post_fork': post_fork,
+            }
+            for chave, valor in opcoes.items():
+                self.cfg.set(chave, valor)
+
+        def load(self):
+            # Importado aqui para que, sem --preload, cada worker carregue o código atual
+            from app import app
+            _configurar_workers(app, args.workers)
+            return app
+
+    Servidor().run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+import os
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+# Sem DATABASE_URL, os testes usam um SQLite temporário
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'testes.db'))
+
+import pytest  # noqa: E402
+
+from app import app as aplicacao, db  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    configuracao = dict(aplicacao.config)
+    aplicacao.config.update(TESTING=True, LIMITES_ATIVOS=False)
+    with aplicacao.app_context():
+        db.drop_all()
+        db.create_all()
+    yield aplicacao
+    barramento = aplicacao.extensions.pop('barramento', None)
+    if barramento is not None and hasattr(barramento, 'parar'):
+        barramento.parar()
+    aplicacao.extensions.pop('limitador', None)
+    aplicacao.extensions.pop('cache_itens', None)
+    aplicacao.config.clear()
+    aplicacao.config.update(configuracao)
+    with aplicacao.app_context():
+        db.session.remove()
+
+
+@pytest.fixture
+def cliente(app):
+    return app.test_client()
+
+
+def banco_com_servidor():
+    return not os.environ['DATABASE_URL'].startswith('sqlite')
@@ -0,0 +1,73 @@
+import pytest
+
+from app import Alteracao, Pessoa, db
+from conftest import banco_com_servidor
+
+
+def _alteracoes(cliente, since=0, recurso='pessoas'):
+    resposta = cliente.get('/{}/changes?since={}'.format(recurso, since))
+    assert resposta.status_code == 200
+    return resposta.json
+
+
+def test_ultima_alteracao_por_registro_e_tombstone(cliente):
+    cliente.post('/pessoas', json={'nome': 'Ana'})
+    cliente.post('/pessoas', json={'nome': 'Bia'})
+    cliente.put('/pessoas/1', json={'nome': 'Ana Maria'})
+    # Atualização sem mudança real não gera alteração
+    cliente.put('/pessoas/1', json={'nome': 'Ana Maria'})
+
+    resposta = _alteracoes(cliente)
+    assert [(a['id'], a['operacao']) for a in resposta['alteracoes']] == [(2, 'criado'), (1, 'atualizado')]
+    assert resposta['alteracoes'][1]['dados']['nome'] == 'Ana Maria'
+    assert resposta['completo'] is True
+
+    cliente.delete('/pessoas/2')
+    seguinte = _alteracoes(cliente, resposta['since'])
+    assert seguinte['alteracoes'] == [{'versao': resposta['since'] + 1, 'id': 2, 'operacao': 'deletado', 'dados': None}]
+
+
+def test_recurso_inexistente_retorna_json(cliente):
+    resposta = cliente.get('/inexistente/changes')
+    assert resposta.status_code == 404
+    assert 'message' in resposta.json
+
+
+def test_numero_atribuido_apenas_no_commit(app):
+    with app.app_context():
+        db.session.add(Pessoa(nome='Ana'))
+        db.session.flush()
+        assert Alteracao.query.count() == 0
+        db.session.commit()
+        assert [a.id for a in Alteracao.query] == [1]
+
+
+def test_rollback_nao_registra_alteracao(app, cliente):
+    with app.app_context():
+        db.session.add(Pessoa(nome='Ana'))
+        db.session.flush()
+        db.session.rollback()
+    cliente.post('/pessoas', json={'nome': 'Bia'})
+    assert [a['versao'] for a in _alteracoes(cliente)['alteracoes']] == [1]
+
+
+@pytest.mark.skipif(not banco_com_servidor(), reason='o SQLite serializa as transações de escrita')
+def test_transacoes_intercaladas_seguem_ordem_de_commit(app, cliente):
+    with app.app_context():
+        primeira = db.session.session_factory()
+        segunda = db.session.session_factory()
+        try:
+            # A primeira transação escreve antes, mas confirma depois da segunda
+            primeira.add(Pessoa(nome='Primeira'))
+            primeira.flush()
+            segunda.add(Pessoa(nome='Segunda'))
+            segunda.commit()
+
+            token = _alteracoes(cliente)['since']
+            primeira.commit()
+        finally:
+            primeira.close()
+            segunda.close()
+
+    nomes = [a['dados']['nome'] for a in _alteracoes(cliente, token)['alteracoes']]
+    assert nomes == ['Primeira']
@@ -0,0 +1,57 @@
+import threading
+import time
+
+from app import Alteracao, CacheLRU, db, obter_cache
+
+
+def test_atualizacao_invalida_o_item(cliente):
+    cliente.post('/pessoas', json={'nome': 'Ana'})
+    id = 1
+    assert cliente.get(f'/pessoas/{id}').json['nome'] == 'Ana'
+    assert cliente.get(f'/pessoas/{id}').json['nome'] == 'Ana'
+    assert obter_cache().metricas()['acertos'] == 1
+    cliente.put(f'/pessoas/{id}', json={'nome': 'Bia'})
+    assert cliente.get(f'/pessoas/{id}').json['nome'] == 'Bia'
+    cliente.delete(f'/pessoas/{id}')
+    assert cliente.get(f'/pessoas/{id}').status_code == 404
+
+
+def test_entrada_expira_apos_o_ttl(monkeypatch):
+    relogio = [100.0]
+    monkeypatch.setattr('app.time.monotonic', lambda: relogio[0])
+    cache = CacheLRU(10, 1024 * 1024, ttl=30)
+    cache.guardar(('pessoas', 1), b'{}', cache.geracao)
+    relogio[0] += 29
+    assert cache.obter(('pessoas', 1)) == b'{}'
+    relogio[0] += 1
+    assert cache.obter(('pessoas', 1)) is None
+    assert cache.metricas()['itens'] == 0
+    assert cache.metricas()['memoria_bytes'] == 0
+
+
+def test_leitura_concorrente_com_invalidacao_nao_guarda_valor_antigo():
+    cache = CacheLRU(10, 1024 * 1024)
+    geracao = cache.geracao
+    # Outra thread confirma uma alteração enquanto a leitura ainda está no banco
+    invalidador = threading.Thread(target=cache.invalidar, args=([{'recurso': 'pessoas', 'id': 1}],))
+    invalidador.start()
+    invalidador.join()
+    cache.guardar(('pessoas', 1), b'antigo', geracao)
+    assert cache.obter(('pessoas', 1)) is None
+
+
+def test_alteracao_de_outro_worker_invalida_pelo_barramento_do_banco(app, cliente):
+    app.config.update(EVENTOS_BROKER='banco', EVENTOS_INTERVALO=0.05)
+    cliente.post('/pessoas', json={'nome': 'Ana'})
+    assert cliente.get('/pessoas/1').json['nome'] == 'Ana'
+    # Outro worker grava direto no banco, sem passar pelo cache deste processo
+    with app.app_context(), db.engine.begin() as conexao:
+        conexao.execute(db.text("UPDATE pessoas SET nome = 'Bia' WHERE id = 1"))
+        conexao.execute(Alteracao.__table__.insert(), [{
+            'id': 2, 'recurso': 'pessoas', 'registro_id': 1, 'operacao': 'atualizado'
+        }])
+    # A invalidação chega em até EVENTOS_INTERVALO segundos
+    prazo = time.monotonic() + 5
+    while cliente.get('/pessoas/1').json['nome'] != 'Bia':
+        assert time.monotonic() < prazo
+        time.sleep(0.05)
@@ -0,0 +1,112 @@
+import threading
+import time
+
+import pytest
+
+from app import PAGINA_EVENTOS, Pessoa, db, obter_barramento
+
+
+def _criar_depois(app, atraso, url, dados):
+    def criar():
+        time.sleep(atraso)
+        app.test_client().post(url, json=dados)
+    threading.Thread(target=criar).start()
+
+
+def test_long_poll_recebe_evento_do_recurso_assinado(app, cliente):
+    _criar_depois(app, 0.1, '/servidores', {'nome': 'Ignorado'})
+    _criar_depois(app, 0.3, '/pessoas', {'nome': 'Ana'})
+    resposta = cliente.get('/eventos/poll?recursos=pessoas&since=0&timeout=5').json
+    assert [(e['recurso'], e['operacao']) for e in resposta['eventos']] == [('pessoas', 'criado')]
+    assert resposta['since'] == resposta['eventos'][-1]['versao']
+
+
+def test_long_poll_retorna_historico_sem_esperar(cliente):
+    cliente.post('/pessoas', json={'nome': 'Ana'})
+    resposta = cliente.get('/eventos/poll?since=0&timeout=5').json
+    assert [e['versao'] for e in resposta['eventos']] == [1]
+
+
+def test_recurso_inexistente_retorna_json(cliente):
+    resposta = cliente.get('/eventos?recursos=pessoas,inexistente')
+    assert resposta.status_code == 400
+    assert 'inexistente' in resposta.json['message']
+
+
+def test_sse_retoma_pelo_last_event_id_e_segue_ao_vivo(app, cliente):
+    app.config['EVENTOS_HEARTBEAT'] = 0.2
+    cliente.post('/pessoas', json={'nome': 'Ana'})
+    cliente.post('/pessoas', json={'nome': 'Bia'})
+    resposta = cliente.get('/eventos?recursos=pessoas', headers={'Last-Event-ID': '1'})
+    partes = iter(resposta.response)
+    assert next(partes).startswith(b'retry:')
+    assert next(partes).startswith(b'id: 2\n')
+    _criar_depois(app, 0.1, '/pessoas', {'nome': 'Caio'})
+    recebidos = [next(partes) for _ in range(2)]
+    assert any(parte.startswith(b'id: 3\nevent: criado') for parte in recebidos)
+    resposta.close()
+    assert not obter_barramento()._assinaturas
+
+
+def test_assinatura_cancelada_mesmo_sem_ler_o_stream(cliente):
+    resposta = cliente.get('/eventos')
+    assert obter_barramento()._assinaturas
+    resposta.close()
+    assert not obter_barramento()._assinaturas
+
+
+class _EngineInstavel:
+    """Falha nas primeiras conexões, como um MySQL reiniciando."""
+
+    def __init__(self, engine, falhas):
+        self.engine = engine
+        self.falhas = falhas
+
+    def connect(self):
+        if self.falhas:
+            self.falhas -= 1
+            raise ConnectionError('banco indisponível')
+        return self.engine.connect()
+
+
+def test_broker_banco_continua_apos_erro_de_conexao(app, cliente):
+    app.config.update(EVENTOS_BROKER='banco', EVENTOS_INTERVALO=0.05)
+    with app.app_context():
+        barramento = obter_barramento()
+    barramento.engine = _EngineInstavel(barramento.engine, falhas=1)
+    # Sem conseguir ler o ponto de partida, a thread não é criada e o próximo uso tenta de novo
+    with pytest.raises(ConnectionError):
+        barramento.iniciar()
+    assert barramento._thread is None
+    barramento.iniciar()
+    barramento.engine.falhas = 2
+    inicio = time.monotonic()
+    while barramento.engine.falhas and time.monotonic() - inicio < 5:
+        time.sleep(0.05)
+    assert barramento.engine.falhas == 0
+    assert barramento._thread.is_alive()
+
+    # No modo banco, o evento só chega pela thread de leitura
+    _criar_depois(app, 0.5, '/pessoas', {'nome': 'Ana'})
+    resposta = cliente.get('/eventos/poll?since=0&timeout=5').json
+    assert [(e['recurso'], e['id']) for e in resposta['eventos']] == [('pessoas', 1)]
+
+
+def test_sse_envia_todo_o_historico_pendente_em_paginas(app, cliente):
+    app.config['EVENTOS_HEARTBEAT'] = 0.2
+    with app.app_context():
+        db.session.add_all(Pessoa(nome='Pessoa {}'.format(n)) for n in range(PAGINA_EVENTOS + 5))
+        db.session.commit()
+    resposta = cliente.get('/eventos', headers={'Last-Event-ID': '0'})
+    partes = iter(resposta.response)
+    assert next(partes).startswith(b'retry:')
+    versoes = [int(next(partes).split(b'\n')[0][4:]) for _ in range(PAGINA_EVENTOS + 5)]
+    assert versoes == list(range(1, PAGINA_EVENTOS + 6))
+    assert next(partes) == b': ping\n\n'
+    resposta.close()
+
+
+def test_long_poll_sem_since_retorna_400(cliente):
+    resposta = cliente.get('/eventos/poll?timeout=0')
+    assert resposta.status_code == 400
+    assert 'since' in resposta.json['message']
@@ -0,0 +1,100 @@
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+
+from app import LimitadorLocal, LimitadorSqlite
+from conftest import RAIZ
+
+
+def test_rajada_esgotada_retorna_429_com_retry_after(app, cliente):
+    app.config.update(LIMITES_ATIVOS=True, LIMITE_LISTAGEM=(1, 3))
+    codigos = [cliente.get('/pessoas').status_code for _ in range(4)]
+    assert codigos == [200, 200, 200, 429]
+    resposta = cliente.get('/pessoas')
+    assert resposta.headers['Retry-After'] == '1'
+    assert 'message' in resposta.json
+    # O orçamento das rotas de item é separado
+    assert cliente.post('/pessoas', json={'nome': 'Ana'}).status_code == 201
+
+
+def test_concorrencia_nunca_passa_do_limite():
+    limitador = LimitadorLocal()
+    ativos, maximo, lock = [0], [0], threading.Lock()
+
+    def requisicao():
+        for _ in range(50):
+            espera, ficha = limitador.admitir('cliente', 1e9, 1e9, 3)
+            if espera:
+                continue
+            with lock:
+                ativos[0] += 1
+                maximo[0] = max(maximo[0], ativos[0])
+            time.sleep(0.001)
+            with lock:
+                ativos[0] -= 1
+            limitador.liberar(ficha)
+
+    threads = [threading.Thread(target=requisicao) for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert maximo[0] == 3
+    assert limitador._ativos == {}
+
+
+def test_stream_sse_ocupa_a_vaga_ate_fechar(app, cliente):
+    app.config.update(LIMITES_ATIVOS=True, CONCORRENCIA_EVENTOS=1)
+    primeiro = cliente.get('/eventos')
+    assert primeiro.status_code == 200
+    assert cliente.get('/eventos').status_code == 429
+    # Outras rotas seguem disponíveis
+    assert cliente.get('/pessoas').status_code == 200
+    primeiro.close()
+    segundo = cliente.get('/eventos')
+    assert segundo.status_code == 200
+    segundo.close()
+
+
+def test_contadores_sqlite_compartilhados_entre_workers(tmp_path):
+    caminho = str(tmp_path / 'limites.db')
+    worker_a, worker_b = LimitadorSqlite(caminho), LimitadorSqlite(caminho)
+    assert worker_a.admitir('c', 0.001, 2, 10)[0] == 0
+    assert worker_b.admitir('c', 0.001, 2, 10)[0] == 0
+    assert worker_a.admitir('c', 0.001, 2, 10)[0] > 0
+
+    espera, ficha = worker_a.admitir('d', 100, 100, 1)
+    assert espera == 0
+    assert worker_b.admitir('d', 100, 100, 1) == (1, None)
+    worker_a.liberar(ficha)
+    assert worker_b.admitir('d', 100, 100, 1)[0] == 0
+
+
+def test_vaga_aberta_conta_enquanto_o_worker_existir(tmp_path, monkeypatch):
+    limitador = LimitadorSqlite(str(tmp_path / 'limites.db'))
+    assert limitador.admitir('c', 100, 100, 1)[0] == 0
+    # Um stream SSE aberto há uma hora ainda ocupa a vaga
+    agora = time.time()
+    monkeypatch.setattr('app.time.time', lambda: agora + 3600)
+    assert limitador.admitir('c', 100, 100, 1) == (1, None)
+
+
+def _ocupar_em_outro_processo(caminho, chave):
+    # O processo termina sem liberar a vaga, como um worker que morreu
+    codigo = 'import sys; from app import LimitadorSqlite; LimitadorSqlite(sys.argv[1]).admitir(sys.argv[2], 100, 100, 5)'
+    subprocess.run([sys.executable, '-c', codigo, caminho, chave], cwd=RAIZ, check=True)
+
+
+def test_vagas_de_worker_morto_sao_removidas(tmp_path):
+    caminho = str(tmp_path / 'limites.db')
+    limitador = LimitadorSqlite(caminho)
+    _ocupar_em_outro_processo(caminho, 'c')
+    assert limitador.admitir('c', 100, 100, 1)[0] == 0
+
+    _ocupar_em_outro_processo(caminho, 'outro')
+    LimitadorSqlite(caminho)
+    with sqlite3.connect(caminho) as conexao:
+        restantes = conexao.execute('SELECT chave FROM ativos').fetchall()
+    assert restantes == [('c',)]
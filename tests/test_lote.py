@@ -0,0 +1,136 @@
+import pytest
+from sqlalchemy import event
+
+from app import db, obter_barramento, obter_cache
+
+
+@pytest.fixture
+def periodos(cliente):
+    # Pessoa 1 tem cinco períodos do tipo 1; pessoa 2 tem um do tipo 2
+    cliente.post('/pessoas', json={'nome': 'Ana'})
+    cliente.post('/pessoas', json={'nome': 'Bia'})
+    cliente.post('/tipos_de_pessoas', json={'tipo': 'Servidor'})
+    cliente.post('/tipos_de_pessoas', json={'tipo': 'Aposentado'})
+    for ano in range(2015, 2020):
+        cliente.post('/pessoa_tipo', json={
+            'pessoa_id': 1, 'tipo_id': 1, 'data_inicio': f'{ano}-01-01', 'data_fim': f'{ano}-12-31'
+        })
+    cliente.post('/pessoa_tipo', json={'pessoa_id': 2, 'tipo_id': 2, 'data_inicio': '2020-01-01'})
+
+
+def _lote(cliente, *operacoes):
+    return cliente.post('/batch', json={'operacoes': list(operacoes)})
+
+
+def test_valor_do_filtro_convertido_para_o_tipo_da_coluna(cliente, periodos):
+    resultados = _lote(
+        cliente,
+        {'recurso': 'pessoa_tipo', 'filtro': {'pessoa_id': '2'}},
+        {'recurso': 'pessoa_tipo', 'filtro': {'pessoa_id': 2}},
+        {'recurso': 'pessoa_tipo', 'filtro': {'data_inicio': '2020-01-01'}},
+    ).json['resultados']
+    assert [[linha['id'] for linha in r['dados']] for r in resultados] == [[6], [6], [6]]
+
+
+def test_operacao_com_muitos_registros_nao_esgota_a_outra(app, cliente, periodos):
+    app.config['LOTE_MAX_REGISTROS'] = 2
+    primeira, segunda = _lote(
+        cliente,
+        {'recurso': 'pessoa_tipo', 'filtro': {'tipo_id': 1}},
+        {'recurso': 'pessoa_tipo', 'filtro': {'tipo_id': 2}},
+    ).json['resultados']
+    assert [linha['id'] for linha in primeira['dados']] == [1, 2]
+    assert primeira['truncado'] is True
+    assert [linha['id'] for linha in segunda['dados']] == [6]
+    assert segunda['truncado'] is False
+
+
+def test_truncado_exato_com_varios_valores(app, cliente, periodos):
+    app.config['LOTE_MAX_REGISTROS'] = 6
+    resultado, = _lote(cliente, {'recurso': 'pessoa_tipo', 'filtro': {'tipo_id': [1, 2]}}).json['resultados']
+    assert len(resultado['dados']) == 6
+    assert resultado['truncado'] is False
+    app.config['LOTE_MAX_REGISTROS'] = 5
+    resultado, = _lote(cliente, {'recurso': 'pessoa_tipo', 'filtro': {'tipo_id': [1, 2]}}).json['resultados']
+    assert [linha['id'] for linha in resultado['dados']] == [1, 2, 3, 4, 5]
+    assert resultado['truncado'] is True
+
+
+def test_filtros_do_mesmo_campo_em_uma_consulta(app, cliente, periodos):
+    consultas = []
+
+    def registrar(conexao, cursor, sql, *args):
+        if 'FROM pessoa_tipo' in sql:
+            consultas.append(sql)
+
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', registrar)
+        try:
+            resultados = _lote(
+                cliente,
+                {'recurso': 'pessoa_tipo', 'filtro': {'pessoa_id': 1}},
+                {'recurso': 'pessoa_tipo', 'filtro': {'pessoa_id': 2}},
+                {'recurso': 'pessoa_tipo', 'filtro': {'pessoa_id': [1, 2]}},
+            ).json['resultados']
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', registrar)
+    assert [len(r['dados']) for r in resultados] == [5, 1, 6]
+    assert len(consultas) == 1
+
+
+def test_lote_inicia_a_leitura_de_invalidacoes(app, cliente, periodos):
+    app.config.update(EVENTOS_BROKER='banco', EVENTOS_INTERVALO=0.05)
+    # Os cadastros da fixture criaram o barramento local
+    app.extensions.pop('barramento')
+    _lote(cliente, {'recurso': 'pessoas', 'ids': [1]})
+    assert obter_barramento()._thread is not None
+
+
+def test_invalidacao_durante_o_lote_nao_guarda_linhas_antigas(app, cliente, periodos):
+    # Uma alteração confirmada logo após a primeira consulta: as linhas das
+    # tabelas seguintes podem vir do snapshot anterior a ela
+    consultas = []
+
+    def invalidar(*args):
+        consultas.append(args)
+        if len(consultas) == 1:
+            obter_cache().invalidar([])
+
+    with app.app_context():
+        event.listen(db.engine, 'after_cursor_execute', invalidar)
+        try:
+            resultados = _lote(
+                cliente,
+                {'recurso': 'pessoas', 'ids': [1]},
+                {'recurso': 'tipos_de_pessoas', 'ids': [1]},
+            ).json['resultados']
+        finally:
+            event.remove(db.engine, 'after_cursor_execute', invalidar)
+    assert [len(r['dados']) for r in resultados] == [1, 1]
+    assert obter_cache().metricas()['itens'] == 0
+
+
+@pytest.mark.parametrize('corpo', [
+    {},
+    {'operacoes': [{'recurso': 'inexistente', 'ids': [1]}]},
+    {'operacoes': [{'recurso': 'pessoas', 'ids': ['1']}]},
+    {'operacoes': [{'recurso': 'pessoas', 'ids': [True]}]},
+    {'operacoes': [{'recurso': 'pessoas', 'filtro': {'senha': 'x'}}]},
+    {'operacoes': [{'recurso': 'pessoa_tipo', 'filtro': {'pessoa_id': 'um'}}]},
+    {'operacoes': [{'recurso': 'pessoa_tipo', 'filtro': {'pessoa_id': 1.5}}]},
+    {'operacoes': [{'recurso': 'pessoa_tipo', 'filtro': {'data_inicio': '01/01/2020'}}]},
+])
+def test_operacao_invalida_retorna_json(cliente, corpo):
+    resposta = cliente.post('/batch', json=corpo)
+    assert resposta.status_code == 400
+    assert 'message' in resposta.json
+
+
+@pytest.mark.parametrize('corpo, tipo', [
+    ('{"operacoes": [', 'application/json'),
+    ('operacoes', 'text/plain'),
+])
+def test_corpo_que_nao_e_json_retorna_json(cliente, corpo, tipo):
+    resposta = cliente.post('/batch', data=corpo, content_type=tipo)
+    assert resposta.status_code == 400
+    assert 'message' in resposta.json
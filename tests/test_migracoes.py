@@ -0,0 +1,60 @@
+import os
+import sqlite3
+import subprocess
+import sys
+from datetime import datetime
+
+import pytest
+
+from conftest import RAIZ
+
+
+def _flask(url, *argumentos):
+    ambiente = dict(os.environ, DATABASE_URL=url, FLASK_APP='app')
+    resultado = subprocess.run(
+        [sys.executable, '-m', 'flask', 'db'] + list(argumentos),
+        cwd=RAIZ, env=ambiente, capture_output=True, text=True
+    )
+    assert resultado.returncode == 0, resultado.stderr
+    return resultado.stdout + resultado.stderr
+
+
+def test_upgrade_check_downgrade_no_sqlite(tmp_path):
+    url = 'sqlite:///' + str(tmp_path / 'migracoes.db')
+    _flask(url, 'upgrade')
+    assert 'No new upgrade operations detected' in _flask(url, 'check')
+    _flask(url, 'downgrade', 'base')
+    _flask(url, 'upgrade')
+
+
+# Com lote=2, cada tabela é preenchida em mais de um lote
+@pytest.mark.parametrize('argumentos', [[], ['-x', 'lote=2']])
+def test_upgrade_preenche_o_feed_com_registros_existentes(tmp_path, argumentos):
+    arquivo = tmp_path / 'existente.db'
+    url = 'sqlite:///' + str(arquivo)
+    _flask(url, 'upgrade', 'ad4a4d2d4a03')
+    with sqlite3.connect(arquivo) as conexao:
+        conexao.executemany('INSERT INTO pessoas (id, nome) VALUES (?, ?)', [(1, 'Ana'), (3, 'Bia')])
+        conexao.execute("INSERT INTO tipos_de_pessoas (id, tipo) VALUES (1, 'Servidor')")
+        conexao.execute('INSERT INTO pessoa_tipo (id, pessoa_id, tipo_id) VALUES (1, 3, 1)')
+    _flask(url, 'upgrade', *argumentos)
+
+    with sqlite3.connect(arquivo) as conexao:
+        feed = conexao.execute(
+            'SELECT id, recurso, registro_id, operacao FROM alteracoes ORDER BY id'
+        ).fetchall()
+        sequencia = conexao.execute('SELECT valor FROM sequencia_alteracoes').fetchone()[0]
+        datas = conexao.execute('SELECT criado_em, atualizado_em FROM pessoas').fetchall()
+        ocorrido_em = conexao.execute('SELECT DISTINCT ocorrido_em FROM alteracoes').fetchall()
+    assert feed == [
+        (1, 'pessoas', 1, 'criado'),
+        (3, 'pessoas', 3, 'criado'),
+        (4, 'tipos_de_pessoas', 1, 'criado'),
+        (5, 'pessoa_tipo', 1, 'criado'),
+    ]
+    # A próxima alteração confirmada recebe o número 6
+    assert sequencia == 5
+    instante = datas[0][0]
+    assert datetime.strptime(instante, '%Y-%m-%d %H:%M:%S.%f')
+    assert set(datas) == {(instante, instante)}
+    assert ocorrido_em == [(instante,)]
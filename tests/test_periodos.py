@@ -0,0 +1,104 @@
+import threading
+import time
+
+import pytest
+
+import app as modulo
+from conftest import banco_com_servidor
+
+
+@pytest.fixture
+def pessoa_e_tipo(cliente):
+    cliente.post('/pessoas', json={'nome': 'Ana'})
+    cliente.post('/tipos_de_pessoas', json={'tipo': 'Servidor'})
+    return {'pessoa_id': 1, 'tipo_id': 1}
+
+
+def test_periodo_sobreposto_retorna_409_com_conflito(cliente, pessoa_e_tipo):
+    periodo = dict(pessoa_e_tipo, data_inicio='2020-01-01', data_fim='2020-12-31')
+    assert cliente.post('/pessoa_tipo', json=periodo).status_code == 201
+    resposta = cliente.post('/pessoa_tipo', json=dict(pessoa_e_tipo, data_inicio='2020-06-01'))
+    assert resposta.status_code == 409
+    assert resposta.json['conflito_id'] == 1
+
+
+@pytest.mark.parametrize('url, corpo', [
+    ('/pessoa_tipo', {'data_inicio': '01/02/2020'}),
+    ('/pessoa_tipo', {'data_inicio': '2020-02-01', 'data_fim': '2020-01-01'}),
+])
+def test_erros_de_validacao_retornam_json(cliente, pessoa_e_tipo, url, corpo):
+    resposta = cliente.post(url, json=dict(pessoa_e_tipo, **corpo))
+    assert resposta.status_code == 400
+    assert 'message' in resposta.json
+
+
+@pytest.mark.parametrize('url', [
+    '/pessoa_tipo/sobrepostos?tipo_id=1&inicio=ontem',
+    '/pessoa_tipo/sobrepostos?tipo_id=1&inicio=2020-02-01&fim=2020-01-01',
+    '/pessoa_tipo/vigentes?data=2020-01-01',
+])
+def test_erros_das_consultas_retornam_json(cliente, url):
+    resposta = cliente.get(url)
+    assert resposta.status_code == 400
+    assert 'message' in resposta.json
+
+
+@pytest.mark.skipif(not banco_com_servidor(), reason='o SQLite ignora FOR UPDATE')
+def test_criacoes_simultaneas_nao_gravam_periodos_sobrepostos(app, cliente, pessoa_e_tipo, monkeypatch):
+    # Atrasa o intervalo entre a verificação e a gravação para que as duas
+    # requisições o atravessem juntas se a pessoa não estiver bloqueada
+    buscar_conflito = modulo.buscar_conflito
+
+    def buscar_devagar(*args, **kwargs):
+        conflito = buscar_conflito(*args, **kwargs)
+        time.sleep(0.3)
+        return conflito
+
+    monkeypatch.setattr(modulo, 'buscar_conflito', buscar_devagar)
+    codigos = []
+
+    def criar(inicio):
+        periodo = dict(pessoa_e_tipo, data_inicio=inicio)
+        codigos.append(app.test_client().post('/pessoa_tipo', json=periodo).status_code)
+
+    threads = [threading.Thread(target=criar, args=(inicio,)) for inicio in ('2020-01-01', '2021-01-01')]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(codigos) == [201, 409]
+    assert len(cliente.get('/pessoas/1/historico').json) == 1
+
+
+@pytest.mark.skipif(not banco_com_servidor(), reason='o SQLite ignora FOR UPDATE')
+def test_atualizacao_simultanea_a_criacao_nao_grava_periodos_sobrepostos(app, cliente, pessoa_e_tipo, monkeypatch):
+    periodo = dict(pessoa_e_tipo, data_inicio='2015-01-01', data_fim='2015-12-31')
+    assert cliente.post('/pessoa_tipo', json=periodo).status_code == 201
+    buscar_conflito = modulo.buscar_conflito
+
+    def buscar_devagar(*args, **kwargs):
+        conflito = buscar_conflito(*args, **kwargs)
+        time.sleep(0.3)
+        return conflito
+
+    monkeypatch.setattr(modulo, 'buscar_conflito', buscar_devagar)
+    codigos = []
+
+    def enviar(metodo, url):
+        corpo = dict(pessoa_e_tipo, data_inicio='2020-01-01', data_fim='2020-12-31')
+        codigos.append(getattr(app.test_client(), metodo)(url, json=corpo).status_code)
+
+    threads = [
+        threading.Thread(target=enviar, args=('put', '/pessoa_tipo/1')),
+        threading.Thread(target=enviar, args=('post', '/pessoa_tipo')),
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(codigos) in ([200, 409], [201, 409])
+    # Se a criação venceu, o período de 2015 continua; se a atualização venceu, não há novo
+    esperado = 2 if 201 in codigos else 1
+    assert len(cliente.get('/pessoas/1/historico').json) == esperado
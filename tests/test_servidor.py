@@ -0,0 +1,24 @@
+import subprocess
+import sys
+
+from conftest import RAIZ
+
+import servidor
+
+
+def test_reciclagem_de_workers_desligada_por_padrao():
+    assert servidor._parse_args([]).max_requests == 0
+
+
+def test_post_fork_nao_importa_o_app_sem_preload():
+    # Sem --preload, o import deve ocorrer no worker já preparado (ex.: gevent)
+    codigo = 'import sys, servidor; servidor.post_fork(None, None); print("app" in sys.modules)'
+    resultado = subprocess.run([sys.executable, '-c', codigo], cwd=RAIZ, capture_output=True, text=True)
+    assert resultado.stdout.strip() == 'False', resultado.stderr
+
+
+def test_varios_workers_usam_o_barramento_do_banco(app):
+    servidor._configurar_workers(app, 1)
+    assert app.config['EVENTOS_BROKER'] == 'local'
+    servidor._configurar_workers(app, 4)
+    assert app.config['EVENTOS_BROKER'] == 'banco'